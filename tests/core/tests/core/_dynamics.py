@@ -0,0 +1,170 @@
+"""
+Shared multi-stream dynamics for the ECC stream tests (Tests 2 and 4).
+
+Each system carries a state vector x = [Sensory, Somatic, Symbolic] that
+decays per stream and is coupled through a binding matrix W. The compiled
+step kernel advances a whole batch of systems at once.
+"""
+
+import math
+import numpy as np
+from numba import njit, prange
+
+# Single precision is plenty for a qualitative 3-stream simulation
+DTYPE = np.float32
+
+# DEFINITION 2: BINDING MATRIX (Interaction Weights)
+
+# NOTE: In the fragmented condition, streams exist but are not dynamically bound.
+# The symbolic stream has no regulatory influence without coupling.
+W_MATRICES = {
+    # No cross-talk. Diagonal matrix.
+    "fragmented": np.array([
+        [0.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0]
+    ], dtype=DTYPE),
+
+    # Balanced coupling.
+    # Sensory <-> Somatic (Strong loop)
+    # Symbolic -> Down-regulates both (Negative feedback)
+    "coherent": np.array([
+        [ 0.0,  0.4, -0.2],  # Sensory affected by Somatic & Symbol
+        [ 0.4,  0.0, -0.2],  # Somatic affected by Sensory & Symbol
+        [ 0.1,  0.1,  0.0]   # Symbol observes both
+    ], dtype=DTYPE),
+
+    # Over-coupling (Positive feedback loops everywhere)
+    "unstable": np.array([
+        [ 0.0,  0.9,  0.5],
+        [ 0.9,  0.0,  0.5],
+        [ 0.5,  0.5,  0.0]
+    ], dtype=DTYPE),
+}
+for _W in W_MATRICES.values():
+    _W.setflags(write=False)
+
+# Internal dampening (decay rate) for each stream
+# 0.9 means it retains 90% of its state (memory)
+DECAY = np.array([0.8, 0.8, 0.95], dtype=DTYPE)
+DECAY.setflags(write=False)
+
+# Counterfactual perturbation: massive shock to the SENSORY stream only
+SHOCK_VECTOR = np.array([5.0, 0.0, 0.0], dtype=DTYPE)
+SHOCK_VECTOR.setflags(write=False)
+
+# Tiny baseline noise (life is never perfectly still)
+NOISE_STD = 0.01
+
+@njit(inline='always')
+def tanh_fast(x):
+    """
+    Rational (Pade-style) approximation of tanh, clamped to +/-1 for |x| > 3.
+    Accurate to ~2% which is plenty for a qualitative simulation.
+    """
+    if abs(x) > 3.0:
+        return math.copysign(1.0, x)
+    x2 = x * x
+    return x * (27.0 + x2) / (27.0 + 9.0 * x2)
+
+@njit(inline='always')
+def _step_system(W, decay, x, out, noise, noise_std, shock):
+    """
+    Advances one system's state x (3,) and writes the result to out,
+    which may be x itself; shock may be None.
+    `noise` holds standard-normal draws, scaled here by noise_std.
+    """
+    # 1. Apply Decay (Self-dynamics)
+    x0 = x[0] * decay[0]
+    x1 = x[1] * decay[1]
+    x2 = x[2] * decay[2]
+
+    # 2. Calculate Cross-Talk (Binding), written out for the 3x3 case
+    r0 = W[0, 0] * x0 + W[0, 1] * x1 + W[0, 2] * x2
+    r1 = W[1, 0] * x0 + W[1, 1] * x1 + W[1, 2] * x2
+    r2 = W[2, 0] * x0 + W[2, 1] * x1 + W[2, 2] * x2
+
+    # 3. Update State
+    # We use a tanh activation to simulate biological saturation constraints
+    # (Neurons can't fire infinitely fast)
+    x0 += tanh_fast(r0)
+    x1 += tanh_fast(r1)
+    x2 += tanh_fast(r2)
+
+    # 4. Inject Shock (Counterfactual Perturbation)
+    if shock is not None:
+        x0 += shock[0]
+        x1 += shock[1]
+        x2 += shock[2]
+
+    # Add tiny baseline noise (life is never perfectly still)
+    out[0] = x0 + noise_std * noise[0]
+    out[1] = x1 + noise_std * noise[1]
+    out[2] = x2 + noise_std * noise[2]
+
+@njit(cache=True)
+def step_streams(W, decay, X, noise, noise_std, shock=None):
+    """
+    Advances a batch of stream systems by one step, in place.
+
+    W has shape (n_systems, 3, 3); X and the pregenerated
+    standard-normal noise have shape (n_systems, 3).
+    """
+    for s in range(X.shape[0]):
+        _step_system(W[s], decay, X[s], X[s], noise[s], noise_std, shock)
+    return X
+
+@njit(cache=True, fastmath=True, parallel=True)
+def simulate_streams(W, decay, n_systems, steps, shock_time, shock, noise, noise_std):
+    """
+    Runs every system for the whole experiment in compiled code.
+
+    W has shape (n_systems, 3, 3) and the standard-normal noise
+    (steps, n_systems, 3), scaled by noise_std inside the kernel;
+    all systems start at rest and receive `shock` at `shock_time`.
+    Returns the trajectory as (n_systems, steps, 3).
+
+    Systems are independent, so each one runs on its own thread and only
+    ever writes its own history[s] slice. All noise is drawn up front by
+    the caller, so results do not depend on thread scheduling.
+
+    Each step reads the previous row of the trajectory and writes the new
+    state straight into the next one, so no separate state buffer is kept.
+    """
+    history = np.empty((n_systems, steps, 3), dtype=W.dtype)
+    rest = np.zeros(3, dtype=W.dtype)
+
+    for s in prange(n_systems):
+        trajectory = history[s]
+        for t in range(steps):
+            x = trajectory[t - 1] if t > 0 else rest
+            if t == shock_time:
+                _step_system(W[s], decay, x, trajectory[t], noise[t, s], noise_std, shock)
+            else:
+                _step_system(W[s], decay, x, trajectory[t], noise[t, s], noise_std, None)
+
+    return history
+
+class StreamSystem:
+    """Single-system wrapper around step_streams."""
+
+    def __init__(self, mode="coherent", seed=None):
+        self.mode = mode
+        self.rng = np.random.default_rng(seed)
+
+        # DEFINITION 1: STREAMS
+        # State Vector x = [Sensory, Somatic, Symbolic]
+        self.x = np.zeros(3, DTYPE)
+        self.decay = DECAY
+        self.W = W_MATRICES[mode]
+
+        # One-system batch views and a reusable noise buffer,
+        # so each step allocates nothing
+        self._W = self.W[None]
+        self._X = self.x[None]
+        self._noise = np.empty((1, 3), DTYPE)
+
+    def step(self, shock=None):
+        self.rng.standard_normal(dtype=DTYPE, out=self._noise)
+        step_streams(self._W, self.decay, self._X, self._noise, NOISE_STD, shock)
+        return self.x
@@ -20,7 +20,12 @@ This is not a proof of consciousness, intelligence, or optimal behavior.
 Results are qualitative and sensitive to parameter choices.
 """
 
+import os
 import numpy as np
+import matplotlib
+# Render off-screen unless a window is explicitly requested (SHOW_PLOTS=1)
+if not os.environ.get("SHOW_PLOTS"):
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
 class DarkRoomEnv:
@@ -29,19 +34,25 @@ class DarkRoomEnv:
         # Loc 0: The "Dark Room" (Zero Noise, Zero Food)
         # Loc 10: The "Canteen" (High Noise, High Food)
         self.length = 11
+
+        # Per-location outcome tables, indexed by location
+        # Hallway: Moderate noise, starving
+        self.noise = np.full(self.length, 2.0)
+        self.energy_gain = np.full(self.length, -1.0)
+        # Dark Room: Silent but starving
+        self.noise[0], self.energy_gain[0] = 0.0, -1.0
+        # Canteen: Loud/Busy but feeds you
+        self.noise[-1], self.energy_gain[-1] = 5.0, 10.0
+
+        # Move offsets available to an agent: Stay, Move Left, Move Right
+        self.moves = np.array([0, -1, 1])
         
     def get_outcome(self, location):
         # Returns (Noise_Variance, Energy_Gain)
-        
-        if location == 0:
-            return 0.0, -1.0   # Dark Room: Silent but starving
-        elif location == self.length - 1:
-            return 5.0, 10.0   # Canteen: Loud/Busy but feeds you
-        else:
-            return 2.0, -1.0   # Hallway: Moderate noise, starving
+        return self.noise[location], self.energy_gain[location]
 
 class Agent:
-    def __init__(self, mode="zombie", start_loc=5):
+    def __init__(self, mode="zombie", start_loc=5, steps=80):
         self.mode = mode
         self.loc = start_loc
         self.energy = 50.0  # Start with half tank
@@ -49,54 +60,47 @@ class Agent:
         self.alive = True
         
         # History
-        self.loc_history = []
-        self.energy_history = []
+        self.loc_history = np.empty(steps, dtype=np.int16)
+        self.energy_history = np.empty(steps, dtype=np.float32)
         
-    def decide_move(self, env):
+    def decide_move(self, env, t):
         if not self.alive:
-            self.loc_history.append(self.loc)
-            self.energy_history.append(0)
+            self.loc_history[t] = self.loc
+            self.energy_history[t] = 0
             return
 
-        # Look at 3 options: Stay, Move Left, Move Right
-        options = [self.loc, max(0, self.loc-1), min(env.length-1, self.loc+1)]
-        best_option = self.loc
-        lowest_cost = float('inf')
-        
-        for opt in options:
-            # Simulate what happens at this option
-            noise, energy_gain = env.get_outcome(opt)
-            
-            # Predict future energy state
-            pred_energy = min(self.max_energy, self.energy + energy_gain)
-            
-            # --- COST FUNCTION ---
-            
-            # Cost 1: Prediction Error (Avoid Noise)
-            cost_surprise = noise 
-            
-            # Cost 2: Homeostatic Error (Avoid Death)
-            # Calculated as deviation from ideal energy (100)
-            cost_homeostasis = (100.0 - pred_energy) 
-
-            # NOTE: This agent implements pure surprise minimization
-            # without any viability or survival constraint.     
-            if self.mode == "zombie":
-                # Agent A: Only cares about minimizing Surprise
-                total_cost = cost_surprise
-                
-            elif self.mode == "embodied":
-                # Agent B: Cares about Surprise + Homeostasis
-                # We weight homeostasis higher as death approaches
-                urgency = 1.0 if self.energy > 30 else 5.0 
-                total_cost = cost_surprise + (urgency * cost_homeostasis * 0.1)
-
-            if total_cost < lowest_cost:
-                lowest_cost = total_cost
-                best_option = opt
-                
-        # Move
-        self.loc = best_option
+        # Look at 3 options: Stay, Move Left, Move Right (walls block movement)
+        options = np.clip(self.loc + env.moves, 0, env.length - 1)
+
+        # Simulate what happens at every option at once
+        noise = env.noise[options]
+
+        # Predict future energy state
+        pred_energy = np.minimum(self.max_energy, self.energy + env.energy_gain[options])
+
+        # --- COST FUNCTION ---
+
+        # Cost 1: Prediction Error (Avoid Noise)
+        cost_surprise = noise
+
+        # Cost 2: Homeostatic Error (Avoid Death)
+        # Calculated as deviation from ideal energy (100)
+        cost_homeostasis = (100.0 - pred_energy)
+
+        # NOTE: This agent implements pure surprise minimization
+        # without any viability or survival constraint.
+        if self.mode == "zombie":
+            # Agent A: Only cares about minimizing Surprise
+            total_cost = cost_surprise
+
+        elif self.mode == "embodied":
+            # Agent B: Cares about Surprise + Homeostasis
+            # We weight homeostasis higher as death approaches
+            urgency = 1.0 if self.energy > 30 else 5.0
+            total_cost = cost_surprise + (urgency * cost_homeostasis * 0.1)
+
+        # Move to the cheapest option (first one wins ties)
+        self.loc = int(options[np.argmin(total_cost)])
         
         # Consume Energy
         actual_noise, energy_gain = env.get_outcome(self.loc)
@@ -109,8 +113,8 @@ class Agent:
             self.alive = False
             
         # Log
-        self.loc_history.append(self.loc)
-        self.energy_history.append(self.energy)
+        self.loc_history[t] = self.loc
+        self.energy_history[t] = self.energy
 
 # --- SIMULATION ---
 
@@ -118,13 +122,13 @@ steps = 80
 env = DarkRoomEnv()
 
 # Initialize Agents
-agent_zombie = Agent("zombie", start_loc=5)
-agent_embodied = Agent("embodied", start_loc=5)
+agent_zombie = Agent("zombie", start_loc=5, steps=steps)
+agent_embodied = Agent("embodied", start_loc=5, steps=steps)
 
 print("Running Simulation...")
 for t in range(steps):
-    agent_zombie.decide_move(env)
-    agent_embodied.decide_move(env)
+    agent_zombie.decide_move(env, t)
+    agent_embodied.decide_move(env, t)
 
 # --- VISUALIZATION ---
 
@@ -156,4 +160,8 @@ plt.legend()
 plt.grid(True, alpha=0.3)
 
 plt.tight_layout()
-plt.show()
+
+if __name__ == "__main__":
+    plt.savefig("dark_room_viability.png", dpi=100)
+if os.environ.get("SHOW_PLOTS"):
+    plt.show()
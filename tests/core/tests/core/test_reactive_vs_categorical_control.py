@@ -12,116 +12,148 @@ This is not a proof of consciousness, intelligence, or optimal control.
 Results are qualitative and sensitive to parameter choices.
 """
 
+import os
 import numpy as np
+import matplotlib
+# Render off-screen unless a window is explicitly requested (SHOW_PLOTS=1)
+if not os.environ.get("SHOW_PLOTS"):
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+from numba import njit
+
+# Agent types are passed into the compiled loop as integer codes
+AGENT_CODES = {"zombie": 0, "coherent": 1}
+
+@njit(cache=True)
+def get_action(agent_type_code, noisy_angle, threshold):
+    """
+    Decides whether to push LEFT (-1) or RIGHT (+1)
+    """
+    if agent_type_code == 0:
+        # ZOMBIE: Reacts to perfect, raw, continuous input.
+        # If it leans 0.00001 left, it pushes right.
+        # Brittle behavior: Over-correction.
+        return -1 if noisy_angle > 0 else 1
+
+    else:
+        # COHERENT: Uses a Symbolic Bottleneck.
+        # It discretizes the world into 3 Symbols:
+        # 0: STABLE (Do nothing)
+        # 1: DANGER_RIGHT
+        # -1: DANGER_LEFT
+
+        # NOTE: This discretization represents structural categorization,
+        # not semantic meaning or language.
+
+        if noisy_angle > threshold:
+            return -1 # Correct Right Lean
+        elif noisy_angle < -threshold:
+            return 1  # Correct Left Lean
+        else:
+            return 0  # Symbol is "Stable" -> Do nothing
+
+@njit(cache=True)
+def run_cartpole(steps, agent_type_codes, threshold, friction, force_mag, noise):
+    """
+    Runs every agent through the whole simulation in compiled code.
+    `agent_type_codes` holds one AGENT_CODES entry per agent, and `noise`
+    the pregenerated perception noise (one sample per step) that all agents
+    share. Returns the angle trajectories as (steps, n_agents).
+    """
+    n_agents = agent_type_codes.shape[0]
+    history = np.empty((steps, n_agents))
+    angle = np.zeros(n_agents)  # Pole angles (0 is vertical)
+    velocity = np.zeros(n_agents)
+
+    for t in range(steps):
+        for a in range(n_agents):
+            # 1. Environment Noise (The "Adversarial Attack") is pregenerated
+            # In a calm room, noise is 0. In a storm, it's high.
+
+            # 2. The Agent sees the angle + noise
+            perceived_angle = angle[a] + noise[t]
+
+            # 3. Agent decides action
+            action = get_action(agent_type_codes[a], perceived_angle, threshold)
+
+            # 4. Physics Update
+            # Force applied by agent
+            force = action * force_mag
+
+            # Update velocity (Gravity pulls it down, Agent pushes it up)
+            velocity[a] += force + (angle[a] * 0.01)
+            velocity[a] *= friction # Damping
+
+            # Update angle
+            angle[a] += velocity[a]
+
+            # Log data
+            history[t, a] = angle[a]
+
+    return history
 
 class CartPoleSimulation:
-    def __init__(self, agent_type="zombie"):
-        self.agent_type = agent_type
-        self.angle = 0.0  # Pole angle (0 is vertical)
-        self.velocity = 0.0
-        self.history = []
-        
+    def __init__(self, agent_types=("zombie", "coherent"), steps=300, seed=None):
+        # A single agent type may be given as a plain string
+        self.agent_types = [agent_types] if isinstance(agent_types, str) else list(agent_types)
+        self.steps = steps
+        self.rng = np.random.default_rng(seed)
+        self.history = np.empty((steps, len(self.agent_types)))
+
         # Physics constants
         self.gravity = 0.1
         self.friction = 0.99
         self.force_mag = 0.05
+        self.noise_std = 0.02
+
+        # The "Symbolic Threshold" (The Governor)
+        self.threshold = 0.05
 
-    def get_action(self, noisy_angle):
-        """
-        Decides whether to push LEFT (-1) or RIGHT (+1)
-        """
-        if self.agent_type == "zombie":
-            # ZOMBIE: Reacts to perfect, raw, continuous input.
-            # If it leans 0.00001 left, it pushes right.
-            # Brittle behavior: Over-correction.
-            return -1 if noisy_angle > 0 else 1
-
-        elif self.agent_type == "coherent":
-            # COHERENT: Uses a Symbolic Bottleneck.
-            # It discretizes the world into 3 Symbols:
-            # 0: STABLE (Do nothing)
-            # 1: DANGER_RIGHT
-            # -1: DANGER_LEFT
-
-            # NOTE: This discretization represents structural categorization,
-            # not semantic meaning or language.
-          
-            # The "Symbolic Threshold" (The Governor)
-            threshold = 0.05 
-            
-            if noisy_angle > threshold:
-                return -1 # Correct Right Lean
-            elif noisy_angle < -threshold:
-                return 1  # Correct Left Lean
-            else:
-                return 0  # Symbol is "Stable" -> Do nothing
-
-    def step(self, t):
-        # 1. Generate Environment Noise (The "Adversarial Attack")
-        # In a calm room, noise is 0. In a storm, it's high.
-        noise = np.random.normal(0, 0.02)
-        
-        # 2. The Agent sees the angle + noise
-        perceived_angle = self.angle + noise
-        
-        # 3. Agent decides action
-        action = self.get_action(perceived_angle)
-        
-        # 4. Physics Update
-        # Force applied by agent
-        force = action * self.force_mag
-        
-        # Update velocity (Gravity pulls it down, Agent pushes it up)
-        self.velocity += force + (self.angle * 0.01) 
-        self.velocity *= self.friction # Damping
-        
-        # Update angle
-        self.angle += self.velocity
-        
-        # Log data
-        self.history.append(self.angle)
+    def run(self):
+        codes = np.array([AGENT_CODES[agent_type] for agent_type in self.agent_types])
+        noise = self.rng.standard_normal(self.steps) * self.noise_std
+        self.history = run_cartpole(
+            self.steps, codes, self.threshold,
+            self.friction, self.force_mag, noise
+        )
+        return self.history
 
 # --- RUN THE TEST ---
 
 steps = 300
+seed = 42 # Both agents see the same, reproducible noise sequence
 
-# 1. Run Zombie
-zombie_sim = CartPoleSimulation("zombie")
-for t in range(steps):
-    zombie_sim.step(t)
+# Run Zombie and Coherent side by side under identical noise
+sim = CartPoleSimulation(("zombie", "coherent"), steps, seed)
+sim.run()
 
-# 2. Run Coherent
-coherent_sim = CartPoleSimulation("coherent")
-for t in range(steps):
-    coherent_sim.step(t)
+# --- VISUALIZATION ---
 
-# --- VISUALIZATION REFACTOR ---
+fig, axes = plt.subplots(1, 2, figsize=(14, 5), sharey=True)
 
-fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+panels = [
+    ("Zombie (Reactive)", 'red'),
+    ("Coherent (Symbolic)", 'blue'),
+]
 
-for i, (name, data) in enumerate(history.items()):
-    data = np.array(data)
+for i, (name, color) in enumerate(panels):
     ax = axes[i]
-    
-    # Plot the 3 Streams
-    ax.plot(data[:, 0], label='Sensory', color='red', linewidth=2, alpha=0.8)
-    ax.plot(data[:, 1], label='Somatic', color='green', linewidth=2, alpha=0.8)
-    ax.plot(data[:, 2], label='Symbolic', color='blue', linestyle='--', linewidth=2)
-    
-    ax.axvline(x=shock_time, color='black', linestyle=':', label='Shock Event')
+
+    ax.plot(sim.history[:, i], label='Pole Angle', color=color, linewidth=2)
+    ax.axhspan(-sim.threshold, sim.threshold, color='green', alpha=0.1, label='Symbolic "Stable" Band')
+    ax.axhline(0, color='black', linewidth=1)
+
     ax.set_title(name)
+    ax.set_xlabel("Time")
     ax.grid(True, alpha=0.3)
-    
-    # FIX: Different scales for different regimes
-    if name == "Unstable (Explosive)":
-        # Let this one autoscale so we see the "Latching" effect (it will go up to ~20)
-        ax.set_ylim(-2, 25) 
-        ax.text(shock_time + 5, 20, "SYSTEM LATCHED", color='red', fontsize=10, fontweight='bold')
-    else:
-        ax.set_ylim(-2, 8) # Focused view for stable systems
 
-    if i == 0: ax.legend(loc='upper right')
+    if i == 0:
+        ax.set_ylabel("Pole Angle (0 = Vertical)")
+        ax.legend(loc='upper right')
 
 plt.tight_layout()
-plt.show()
+
+if __name__ == "__main__":
+    plt.savefig("reactive_vs_categorical_control.png", dpi=100)
+if os.environ.get("SHOW_PLOTS"):
+    plt.show()
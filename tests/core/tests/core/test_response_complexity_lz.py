@@ -18,99 +18,126 @@ integrated information, or clinical PCI.
 Results are illustrative and sensitive to discretization and parameter choices.
 """
 
+import os
 import numpy as np
+import matplotlib
+# Render off-screen unless a window is explicitly requested (SHOW_PLOTS=1)
+if not os.environ.get("SHOW_PLOTS"):
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import zlib  # Used for compression (LZ77 algorithm variant)
 
+# System simulation is shared with Test 2
+from _dynamics import DTYPE, DECAY, NOISE_STD, SHOCK_VECTOR, W_MATRICES, simulate_streams
+
 # --- HELPER: COMPLEXITY METRIC ---
+def binarize_response(data_matrix):
+    """Thresholds continuous data at its mean and flattens it to a bit vector."""
+    # Binarize: Is the value increasing or decreasing? (Simple derivative encoding)
+    # Or simply: Is it above the mean? Let's use Mean Thresholding.
+    threshold = np.mean(data_matrix)
+    return (data_matrix > threshold).astype(np.uint8).ravel()
+
 def calculate_lz_complexity(data_matrix):
     """
     Approximates Lempel-Ziv complexity using compression size.
     1. Discretize continuous data into binary (0 or 1).
-    2. Convert to a string.
+    2. Pack the bits into a real bitstream (8 samples per byte).
     3. Compress and measure size.
+
+    NOTE: Scores measure the compressibility of the packed bitstream, not
+    of an ASCII "0"/"1" rendering, so absolute values are smaller than
+    with string encoding. Only the ranking across regimes is meaningful.
     """
-    # 1. Binarize: Is the value increasing or decreasing? (Simple derivative encoding)
-    # Or simply: Is it above the mean? Let's use Mean Thresholding.
-    threshold = np.mean(data_matrix)
-    binary_matrix = (data_matrix > threshold).astype(int)
+    # 1. Binarize
+    bits = binarize_response(data_matrix)
     
-    # 2. Flatten to a single string of bits for the whole system state over time
-    binary_string = "".join(map(str, binary_matrix.flatten()))
+    # 2. Flatten to a single bitstream for the whole system state over time
+    packed = np.packbits(bits).tobytes()
     
     # 3. Compress using zlib (Standard DEFLATE/LZ77)
-    compressed_data = zlib.compress(binary_string.encode('utf-8'))
+    compressed_data = zlib.compress(packed, level=6)
     
     # Complexity = Size of compressed data / Size of original data
     # Higher Ratio = Harder to compress = Higher Complexity
     return len(compressed_data)
 
-# --- SYSTEM SIMULATION (Reused from Test 2) ---
-class StreamSystem:
-    def __init__(self, mode="coherent"):
-        self.mode = mode
-        self.x = np.zeros(3)
-        self.decay = np.array([0.8, 0.8, 0.95]) 
-        
-        if mode == "fragmented":
-            self.W = np.zeros((3,3)) # No binding
-        elif mode == "coherent":
-            self.W = np.array([
-                [ 0.0,  0.4, -0.2],
-                [ 0.4,  0.0, -0.2],
-                [ 0.1,  0.1,  0.0]
-            ])
-        elif mode == "unstable":
-            self.W = np.array([
-                [ 0.0,  0.9,  0.5],
-                [ 0.9,  0.0,  0.5],
-                [ 0.5,  0.5,  0.0]
-            ])
-
-    def step(self, shock=None):
-        self.x = self.x * self.decay
-        interaction = np.tanh(np.dot(self.W, self.x))
-        self.x += interaction
-        if shock is not None: self.x += shock
-        self.x += np.random.normal(0, 0.01, 3) # Tiny noise
-        return self.x
+def lz_complexity_profile(data_matrix, chunk_steps=8):
+    """
+    Cumulative compressed size (bytes) of the response after every
+    `chunk_steps` timesteps (rows of data_matrix), using the same encoding
+    as calculate_lz_complexity. The last entry equals its score.
+
+    Checkpoints must fall on byte boundaries of the packed bitstream, so
+    chunk_steps * bits_per_step must be a multiple of 8 (for 3 streams:
+    chunk_steps a multiple of 8).
+
+    The bitstream goes through one streaming compressor, but each checkpoint
+    flushes a copy of it, which re-encodes everything still buffered. For
+    short responses that is the whole prefix, so the cost is comparable to
+    recompressing every prefix; use calculate_lz_complexity for one score.
+    """
+    bits = binarize_response(data_matrix)
+    bits_per_step = bits.size // len(data_matrix)
+    chunk_bits = chunk_steps * bits_per_step
+    if chunk_steps <= 0 or chunk_bits % 8:
+        raise ValueError(
+            "chunk_steps * bits_per_step must be a positive multiple of 8 "
+            f"(got chunk_steps={chunk_steps}, bits_per_step={bits_per_step})"
+        )
+    chunk_bytes = chunk_bits // 8
+    packed = np.packbits(bits).tobytes()
+    
+    compressor = zlib.compressobj(6)
+    emitted = 0
+    sizes = []
+    for start in range(0, len(packed), chunk_bytes):
+        emitted += len(compressor.compress(packed[start:start + chunk_bytes]))
+        # Size so far = bytes already emitted + what flushing now would add
+        sizes.append(emitted + len(compressor.copy().flush()))
+    
+    return np.array(sizes)
 
 # --- RUN EXPERIMENT ---
 
 steps = 150
 shock_time = 30
-shock_vector = np.array([5.0, 0.0, 0.0])
+seed = 42 # Fixed seed so runs are reproducible
+shock_vector = SHOCK_VECTOR
 
 systems = {
-    "Fragmented": StreamSystem("fragmented"),
-    "Unstable (Seizure)": StreamSystem("unstable"),
-    "Coherent":     StreamSystem("coherent")
+    "Fragmented": "fragmented",
+    "Unstable (Seizure)": "unstable",
+    "Coherent":     "coherent"
 }
 
-results = {name: [] for name in systems}
+W = np.stack([W_MATRICES[mode] for mode in systems.values()])
+rng = np.random.default_rng(seed)
+noise = rng.standard_normal((steps, len(systems), 3), dtype=DTYPE)
+
+# Run the whole experiment in one compiled call
+history = simulate_streams(W, DECAY, len(systems), steps, shock_time, shock_vector, noise, NOISE_STD)
 
-# Run loop
-for t in range(steps):
-    shock = shock_vector if t == shock_time else None
-    for name, sys in systems.items():
-        state = sys.step(shock)
-        # We record the response AFTER the shock for complexity analysis
-        if t >= shock_time:
-            results[name].append(state.copy())
+# We record the response AFTER the shock for complexity analysis
+results = {name: history[i, shock_time:] for i, name in enumerate(systems)}
 
 # --- CALCULATE COMPLEXITY ---
+chunk_steps = 8
 complexity_scores = {}
+complexity_profiles = {}
 print("--- COMPLEXITY SCORES (Higher is better) ---")
 for name, data in results.items():
-    data_array = np.array(data)
-    score = calculate_lz_complexity(data_array)
+    profile = lz_complexity_profile(data, chunk_steps)
+    score = calculate_lz_complexity(data)
+    complexity_profiles[name] = profile
     complexity_scores[name] = score
     print(f"{name}: {score}")
 
 # --- VISUALIZATION ---
-plt.figure(figsize=(10, 6))
+plt.figure(figsize=(16, 6))
 
 # Bar Chart of Complexity
+plt.subplot(1, 2, 1)
 names = list(complexity_scores.keys())
 scores = list(complexity_scores.values())
 colors = ['gray', 'red', 'blue']
@@ -128,9 +155,24 @@ plt.ylabel("Compressed Information Size (Bytes)")
 plt.ylim(0, max(scores) * 1.2)
 plt.grid(axis='y', alpha=0.3)
 
+# Complexity accumulated over post-shock time (same compression pass)
+plt.subplot(1, 2, 2)
+for (name, profile), color in zip(complexity_profiles.items(), colors):
+    checkpoints = np.minimum(np.arange(1, len(profile) + 1) * chunk_steps, steps - shock_time)
+    plt.plot(checkpoints, profile, color=color, label=name, linewidth=2, marker='o')
+plt.title("Cumulative Complexity After Perturbation")
+plt.xlabel("Time Since Shock")
+plt.ylabel("Compressed Information Size (Bytes)")
+plt.legend()
+plt.grid(True, alpha=0.3)
+
 # Add definition annotations
 plt.figtext(0.5, 0.01, 
             "Fragmented: Signals die out (Low Info).  Unstable: Repetitive loops (Redundant).  Coherent: Structured Integration (High Info).", 
             ha="center", fontsize=9, bbox={"facecolor":"white", "alpha":0.5, "pad":5})
 
-plt.show()
+
+if __name__ == "__main__":
+    plt.savefig("response_complexity_lz.png", dpi=100)
+if os.environ.get("SHOW_PLOTS"):
+    plt.show()
@@ -20,103 +20,49 @@ This is not a proof of consciousness, intelligence, or biological realism.
 Results are illustrative and sensitive to parameter choices.
 """
 
+import os
 import numpy as np
+import matplotlib
+# Render off-screen unless a window is explicitly requested (SHOW_PLOTS=1)
+if not os.environ.get("SHOW_PLOTS"):
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
-class StreamSystem:
-    def __init__(self, mode="coherent"):
-        self.mode = mode
-        
-        # DEFINITION 1: STREAMS
-        # State Vector x = [Sensory, Somatic, Symbolic]
-        self.x = np.zeros(3)
-        
-        # Internal dampening (decay rate) for each stream
-        # 0.9 means it retains 90% of its state (memory)
-        self.decay = np.array([0.8, 0.8, 0.95]) 
-        
-        # DEFINITION 2: BINDING MATRIX (Interaction Weights)
-
-        # NOTE: In the fragmented condition, streams exist but are not dynamically bound.
-        # The symbolic stream has no regulatory influence without coupling.
-        if mode == "fragmented":
-            # No cross-talk. Diagonal matrix.
-            self.W = np.array([
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0]
-            ])
-            
-        elif mode == "coherent":
-            # Balanced coupling.
-            # Sensory <-> Somatic (Strong loop)
-            # Symbolic -> Down-regulates both (Negative feedback)
-            self.W = np.array([
-                [ 0.0,  0.4, -0.2],  # Sensory affected by Somatic & Symbol
-                [ 0.4,  0.0, -0.2],  # Somatic affected by Sensory & Symbol
-                [ 0.1,  0.1,  0.0]   # Symbol observes both
-            ])
-            
-        elif mode == "unstable":
-            # Over-coupling (Positive feedback loops everywhere)
-            self.W = np.array([
-                [ 0.0,  0.9,  0.5],
-                [ 0.9,  0.0,  0.5],
-                [ 0.5,  0.5,  0.0]
-            ])
-
-    def step(self, shock=None):
-        # 1. Apply Decay (Self-dynamics)
-        self.x = self.x * self.decay
-        
-        # 2. Calculate Cross-Talk (Binding)
-        # We use a tanh activation to simulate biological saturation constraints
-        # (Neurons can't fire infinitely fast)
-        interaction = np.tanh(np.dot(self.W, self.x))
-        
-        # 3. Update State
-        self.x += interaction
-        
-        # 4. Inject Shock (Counterfactual Perturbation)
-        if shock is not None:
-            self.x += shock
-            
-        # Add tiny baseline noise (life is never perfectly still)
-        self.x += np.random.normal(0, 0.01, 3)
-        
-        return self.x
+from _dynamics import DTYPE, DECAY, NOISE_STD, SHOCK_VECTOR, W_MATRICES, simulate_streams
 
 # --- SIMULATION PARAMETERS ---
 
 steps = 100
 shock_time = 30
-shock_vector = np.array([5.0, 0.0, 0.0]) # Massive shock to SENSORY stream only
+seed = 42 # Fixed seed so runs are reproducible
+shock_vector = SHOCK_VECTOR # Massive shock to SENSORY stream only
 
 # Initialize Systems
 systems = {
-    "Fragmented (Unbound)": StreamSystem("fragmented"),
-    "Coherent (Bound)":     StreamSystem("coherent"),
-    "Unstable (Explosive)": StreamSystem("unstable")
+    "Fragmented (Unbound)": "fragmented",
+    "Coherent (Bound)":     "coherent",
+    "Unstable (Explosive)": "unstable"
 }
 
-# Data Storage
-history = {name: [] for name in systems}
+# Stack every system into one batch: W is (3, 3, 3)
+W = np.stack([W_MATRICES[mode] for mode in systems.values()])
 
-# --- RUN LOOP ---
+# Baseline noise for the whole run, drawn once: (steps, system, stream)
+# Raw standard-normal draws; the kernel scales them by NOISE_STD
+rng = np.random.default_rng(seed)
+noise = rng.standard_normal((steps, len(systems), 3), dtype=DTYPE)
 
-for t in range(steps):
-    shock = shock_vector if t == shock_time else None
-    
-    for name, sys in systems.items():
-        state = sys.step(shock)
-        history[name].append(state.copy())
+# --- RUN ---
+
+# Data Storage: (system, steps, stream), one contiguous trajectory per system
+history = simulate_streams(W, DECAY, len(systems), steps, shock_time, shock_vector, noise, NOISE_STD)
 
 # --- VISUALIZATION ---
 
 fig, axes = plt.subplots(1, 3, figsize=(18, 5))
 
-for i, (name, data) in enumerate(history.items()):
-    data = np.array(data)
+for i, name in enumerate(systems):
+    data = history[i]
     ax = axes[i]
     
     # Plot the 3 Streams
@@ -132,4 +78,8 @@ for i, (name, data) in enumerate(history.items()):
     if i == 0: ax.legend()
 
 plt.tight_layout()
-plt.show()
+
+if __name__ == "__main__":
+    plt.savefig("structural_integrity_binding.png", dpi=100)
+if os.environ.get("SHOW_PLOTS"):
+    plt.show()